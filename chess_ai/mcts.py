@@ -9,7 +9,6 @@ from typing import Optional
 import neat.nn
 from neat.nn import FeedForwardNetwork
 
-from chess_logic.board import State
 from chess_logic.core_chess import Chess, PerformedMove
 from chess_logic.move_generation import Move, Moves
 
@@ -64,7 +63,6 @@ class MCTS:
         self.chess_state: Optional[Chess] = None
         self.root: Optional[Node] = None
         self.initial_moves: Optional[Moves] = None
-        self.initial_state: Optional[State] = None
 
     def best_move(
         self, chess_state: Chess, engine: FeedForwardNetwork, num_simulations: int
@@ -73,7 +71,6 @@ class MCTS:
         self.chess_state = chess_state
         initial_side = self.chess_state.next_side
         self.initial_moves = self.chess_state.current_legal_moves
-        self.initial_state = self.chess_state.current_state
         self.root = Node()
         self.expand_node(self.root)
 
@@ -122,4 +119,4 @@ class MCTS:
         """Undoes moves made to chess state based on order given"""
         for performed_move in reversed(undo_path):
             self.chess_state.undo_move(performed_move, update=False)
-        self.chess_state.update_board_state(self.initial_moves, self.initial_state)
+        self.chess_state.update_board_state(self.initial_moves)
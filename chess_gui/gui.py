@@ -4,16 +4,17 @@ state
 """
 
 import os
-from bisect import bisect_right
 from copy import deepcopy
-from functools import partial
-from itertools import cycle, product
+from functools import lru_cache, partial
+from itertools import cycle
 from operator import mul, sub
-from threading import Thread
-from time import process_time
-from typing import Any, Callable, Iterable, Optional
+from queue import Queue
+from threading import Lock, Thread
+from time import monotonic_ns
+from typing import Any, Callable, Hashable, Iterable, Optional
 from warnings import warn
 
+import numpy as np
 import pygame
 import pygame.freetype
 import pygame_widgets
@@ -47,6 +48,8 @@ PIECE_IMAGES = {
     piece: load_image(f"{PIECE_SIDE[piece]}_{piece.upper()}") for piece in PIECES
 }
 RESTART_ICON = load_image("RESTART")
+# Caches scaled images by original image and size (shared by all GUI instances)
+SCALED_IMAGES: dict[tuple[pygame.surface.Surface, Coord], pygame.surface.Surface] = {}
 
 PLAYERS = ["HUMAN", "AI"]
 try:
@@ -65,11 +68,27 @@ GAME_FONT: pygame.freetype.Font  # type: ignore[name-defined]
 GAME_FONT = pygame.freetype.SysFont("Verdana", 0)
 SCREEN_WIDTH, SCREEN_HEIGHT = DISPLAY_SIZE = 1536, 864
 MOVE_COLOUR = 65, 187, 128
+PROMOTION_MESSAGE = "Choose the promotion piece:"
+REFERENCE_FONT_SIZE, MAX_FONT_SIZE = 20, 99.9
+FRAME_RATE, EVENT_TIMEOUT = 60, 16
+HANDLED_EVENTS = [
+    pygame.QUIT,
+    pygame.VIDEORESIZE,
+    pygame.WINDOWEXPOSED,
+    pygame.MOUSEBUTTONDOWN,
+    pygame.MOUSEBUTTONUP,
+]
 
 
-def rect_range(rect: pygame.Rect):
-    """Returns all coordinates within specified pygame Rect object"""
-    return product(*(range(rect[i], sum(rect[i::2])) for i in range(2)))
+@lru_cache(maxsize=128)
+def reference_text_width(text: str) -> int:
+    """Returns width of text in preconfigured font at reference font size"""
+    return GAME_FONT.get_rect(text, size=REFERENCE_FONT_SIZE).width
+
+
+def rect_range(rect: pygame.Rect) -> np.ndarray:
+    """Returns array of all coordinates within specified pygame Rect object"""
+    return np.mgrid[rect.left : rect.right, rect.top : rect.bottom].reshape(2, -1).T
 
 
 class Design(pygame.Surface):
@@ -87,41 +106,227 @@ class Design(pygame.Surface):
 
         # Creates subsurface for area of design window not covered by board
         board = self.square_size * 8, 0
-        self.non_board_area = self.subsurface(*board, *map(sub, DISPLAY_SIZE, board))
+        self.non_board_rect = pygame.Rect(*board, *map(sub, DISPLAY_SIZE, board))
+        self.non_board_area = self.subsurface(self.non_board_rect)
+
+        # Precomputes pixels, rects and colours of squares (fixed for design surface)
+        self.square_pixels = {
+            square: self.calculate_square_pixel(square) for square in ROWS_AND_COLUMNS
+        }
+        self.square_rects = {
+            square: self.calculate_square_rect(square) for square in ROWS_AND_COLUMNS
+        }
+        # Stores coordinates within square relative to its top-left corner
+        self.square_offsets = rect_range(pygame.Rect(0, 0, *(self.square_size,) * 2))
+        self.square_colours = {
+            (row, column): self.board_colours[(row ^ column) & 1]
+            for row, column in ROWS_AND_COLUMNS
+        }
+
+        # Renders board squares once, enabling board to be drawn with a single blit
+        self.board_background = pygame.Surface((self.square_size * 8,) * 2)
+        for square_coords, square_rect in self.square_rects.items():
+            self.board_background.fill(self.square_colours[square_coords], square_rect)
 
     def dimension_to_pixel(self, dimension: int) -> int:
         """Scales row/column to pixel coordinate"""
         return dimension * self.square_size
 
-    def square_to_pixel(self, square: Coord) -> Coord:
-        """Returns pixel coordinate equivalent of square coordinate"""
+    def calculate_square_pixel(self, square: Coord) -> Coord:
+        """Calculates pixel coordinate equivalent of square coordinate"""
         return tuple(
             map(self.dimension_to_pixel, square[::-1])  # type: ignore[return-value]
         )
 
-    def get_square_rect(self, square: Coord) -> pygame.Rect:
-        """Returns pygame 'Rect' object for specified row and column"""
+    def square_to_pixel(self, square: Coord) -> Coord:
+        """Returns pixel coordinate equivalent of square coordinate"""
+        if (pixel := self.square_pixels.get(square)) is None:
+            pixel = self.calculate_square_pixel(square)
+        return pixel
+
+    def calculate_square_rect(self, square: Coord) -> pygame.Rect:
+        """Calculates pygame 'Rect' object for specified row and column"""
         return pygame.Rect(
             *(list(self.square_to_pixel(square)) + [self.square_size] * 2)
         )
 
-    def get_square_range(self, square: Coord) -> Iterable[Coord]:
+    def get_square_rect(self, square: Coord) -> pygame.Rect:
+        """Returns pygame 'Rect' object for specified row and column (not to mutate)"""
+        if (rect := self.square_rects.get(square)) is None:
+            rect = self.calculate_square_rect(square)
+        return rect
+
+    def get_square_range(self, square: Coord) -> np.ndarray:
         """Returns all coordinates within specified square"""
-        return rect_range(self.get_square_rect(square))
+        return self.square_offsets + self.square_to_pixel(square)
 
     def get_square_colour(self, square: Coord) -> tuple[int, int, int]:
         """Returns colour on board of given square"""
-        return self.board_colours[sum(square) % 2]
+        return self.square_colours[square]
 
     def draw_board_squares(self) -> None:
         """Draws the board on the screen"""
-        # Loops through each row and column, drawing each square within the board
-        for square_coords in ROWS_AND_COLUMNS:
-            pygame.draw.rect(
-                self,
-                self.get_square_colour(square_coords),
-                self.get_square_rect(square_coords),
+        self.blit(self.board_background, (0, 0))
+
+
+class Controls:
+    """Tracks the buttons, square click handlers and selected square of the GUI"""
+
+    def __init__(
+        self,
+        design: Design,
+        show_moves: Callable[[Coord], Any],
+        switch_player: Callable[[str], Any],
+    ) -> None:
+        """Initialises empty button registry and creates reusable click handlers"""
+        self.design = design
+        self.selected_square: Optional[Coord] = None
+        # Maps button keys to buttons and options (e.g. text/radius) created with
+        self.buttons: dict[Hashable, tuple[Button, dict[str, Any]]] = {}
+        # Maps board squares to click handlers (board squares are hit-tested directly)
+        self.square_handlers: dict[Coord, Callable[[], Any]] = {}
+        self.move_squares: list[Coord] = []
+
+        # Creates button callbacks once rather than for every button on every redraw
+        self.show_moves_handlers = {
+            square: partial(show_moves, square) for square in ROWS_AND_COLUMNS
+        }
+        self.switch_player_handlers = {
+            side: partial(switch_player, side) for side in SIDES
+        }
+
+    def get_button(
+        self,
+        key: Hashable,
+        rect: pygame.rect.Rect,
+        func: Callable[[], Any],
+        colour: Optional[str | tuple[int, int, int]],
+        **kwargs,
+    ) -> Button:
+        """
+        Returns persistent button identified by key (creating it upon first request or
+        when options passed change), registered with the widget handler and positioned
+        within given 'Rect' object
+        """
+        button, button_kwargs = self.buttons.get(key, (None, None))
+        widgets = pygame_widgets.WidgetHandler.getWidgets()
+        if button is None or button_kwargs != kwargs:
+            # Recreates button if options changed ('Button' only applies on creation)
+            if button in widgets:
+                widgets.remove(button)
+            button = Button(
+                self.design, *rect, inactiveColour=colour, onRelease=func, **kwargs
             )
+            self.buttons[key] = button, kwargs
+            return button
+
+        # Moves button back to design coordinates and updates its appearance/function
+        # pylint: disable=protected-access
+        button._x, button._y, button._width, button._height = rect
+        button.inactiveColour = button.colour = colour
+        button.setOnRelease(func)
+        if button not in widgets:
+            widgets.append(button)
+        return button
+
+    def click_square(self, x: int, y: int) -> None:
+        """Calls click handler (if any) of board square at given design position"""
+        square = y // self.design.square_size, x // self.design.square_size
+        if (handler := self.square_handlers.get(square)) is not None:
+            handler()
+
+
+class RenderCache:
+    """Tracks what the display shows so only changed areas are rescaled and rendered"""
+
+    def __init__(self, display_size: Coord) -> None:
+        """Initialises caches for display of given size (to be fully redrawn)"""
+        self.display_size = display_size
+        self.outdated = True
+        self.dirty_rects: list[pygame.Rect] = []
+        self.text_surfaces: dict[tuple[str, float], pygame.surface.Surface] = {}
+        # Tracks appearance of squares shown on display to only rescale changed areas
+        self.square_states: dict[Coord, Hashable] = {}
+
+    def render_changes(self, display: pygame.surface.Surface) -> None:
+        """Renders changed areas of display, flipping whole display if many changed"""
+        if not self.dirty_rects:
+            return
+        max_rect_area = 0.05 * display.get_width() * display.get_height()
+        if len(self.dirty_rects) <= 5 and all(
+            rect.width * rect.height <= max_rect_area for rect in self.dirty_rects
+        ):
+            pygame.display.update(self.dirty_rects)
+        else:
+            pygame.display.flip()
+        self.dirty_rects.clear()
+
+    def get_text_surface(self, text: str, width: float) -> pygame.surface.Surface:
+        """Returns text rendered at largest font size fitting width (cached)"""
+        if (text_surface := self.text_surfaces.get((text, width))) is None:
+            # Scales size linearly from width at reference size, then corrects any
+            # overflow caused by font hinting
+            reference_width = reference_text_width(text)
+            size = MAX_FONT_SIZE
+            if reference_width:
+                size = min(size, REFERENCE_FONT_SIZE * width / reference_width)
+            while size > 0.1 and GAME_FONT.get_rect(text, size=size).width > width:
+                size -= 0.1
+            text_surface = GAME_FONT.render(text, "white", size=size)[0].convert_alpha()
+            self.text_surfaces[text, width] = text_surface
+        return text_surface
+
+    def changed_squares(self, square_states: dict[Coord, Hashable]) -> list[Coord]:
+        """Returns squares whose appearance differs from that shown on display"""
+        return [
+            square_coords
+            for square_coords in ROWS_AND_COLUMNS
+            if square_states.get(square_coords) != self.square_states.get(square_coords)
+        ]
+
+
+class EngineWorker:
+    """Searches for engine moves for the GUI on a single persistent worker thread"""
+
+    def __init__(self, gui: "ChessGUI") -> None:
+        """Initialises idle engine state for given GUI (thread started when needed)"""
+        self.gui = gui
+        self.searching = False
+        self.best_move: Optional[Move] = None
+        self.queue: Queue[Chess] = Queue()
+        self.lock = Lock()
+        self.thread: Optional[Thread] = None
+
+    def run(self) -> None:
+        """Searches for best engine move for each chess state placed in engine queue"""
+        while True:
+            chess_state = self.queue.get()
+            best_move = best_engine_move(chess_state, 10000)
+            with self.lock:
+                self.searching = False
+                # Verifies state hasn't changed since move request initiated
+                if (
+                    self.gui.chess.next_side == chess_state.next_side
+                    and self.gui.current_players[SIDES[chess_state.next_side]] == "AI"
+                ):
+                    self.best_move = best_move
+
+    def check_engine_move(self) -> None:
+        """Checks if it is engine's turn to move, queueing search for worker if so"""
+        chess = self.gui.chess
+        with self.lock:
+            if (
+                chess.game_over
+                or self.searching
+                or self.gui.current_players[SIDES[chess.next_side]] != "AI"
+            ):
+                return
+            self.searching = True
+        # Starts single persistent worker thread upon first engine move request
+        if self.thread is None:
+            self.thread = Thread(target=self.run, daemon=True)
+            self.thread.start()
+        self.queue.put(deepcopy(chess))
 
 
 class ChessGUI:
@@ -146,24 +351,57 @@ class ChessGUI:
         pygame.display.set_caption("Chess GUI")
 
         self.design = Design()
-        self.display = pygame.display.set_mode(display_size, pygame.RESIZABLE)
-        self.selected_square: Optional[Coord] = None
+        # Reuses existing window if it already has requested size (e.g. between tests)
+        display = pygame.display.get_surface()
+        if display is not None and display.get_size() == tuple(display_size):
+            self.display = display
+        else:
+            self.display = pygame.display.set_mode(display_size, pygame.RESIZABLE)
+        # Stops unused events (e.g. mouse motion) from reaching the event queue
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(HANDLED_EVENTS)
         self.running = True
-        self.searching = False
-        self.best_engine_move: Optional[Move] = None
+        self.render_cache = RenderCache(self.display.get_size())
+        self.controls = Controls(self.design, self.show_moves, self.switch_player)
 
         # Initialises chess object (manages chess rules for GUI) and engine-related data
         self.chess = Chess(fen)
         self.current_players = dict(zip(SIDES, cycle(PLAYERS)))
         self.display_only = display_only
         self.display_message = display_message
+        self.engine = EngineWorker(self)
 
+        # Pre-scales piece images and pre-renders static text
+        for image in PIECE_IMAGES.values():
+            self.rect_scaled_img(image, self.design.get_square_rect((0, 0)))
+        self.render_cache.get_text_surface(
+            PROMOTION_MESSAGE, 0.8 * self.design.non_board_area.get_width()
+        )
         # Draws the board automatically
         self.draw_board()
 
-    def update(self) -> None:
-        """Scales dummy design window to actual screen size and renders changes"""
-        pygame.transform.smoothscale(self.design, self.display.get_size(), self.display)
+    def update(self, rect: Optional[pygame.Rect] = None) -> None:
+        """
+        Scales dummy design window (or only given region of it) to actual screen size,
+        marking the changed area of the display for rendering
+        """
+        if rect is None:
+            pygame.transform.smoothscale(
+                self.design, self.display.get_size(), self.display
+            )
+            self.render_cache.dirty_rects.append(self.display.get_rect())
+            return
+
+        rect = rect.clip(self.design.get_rect())
+        left, top, right, bottom = self.scale_coords(rect.topleft + rect.bottomright)
+        display_rect = pygame.Rect(left, top, right - left, bottom - top)
+        if display_rect.width and display_rect.height:
+            pygame.transform.smoothscale(
+                self.design.subsurface(rect),
+                display_rect.size,
+                self.display.subsurface(display_rect),
+            )
+            self.render_cache.dirty_rects.append(display_rect)
 
     def scale_coords(
         self,
@@ -173,12 +411,17 @@ class ChessGUI:
     ) -> list[int]:
         """Generates coordinates after design coordinates scaled to display"""
         if final_resolution is None:
-            final_resolution = self.display.get_size()
+            final_resolution = self.render_cache.display_size
+        (initial_width, initial_height), (final_width, final_height) = (
+            initial_resolution,
+            final_resolution,
+        )
+        # Alternates between scaling x (even indices) and y (odd indices) coordinates
         return [
-            int(coord * final_size / initial_size)
-            for coord, initial_size, final_size in zip(
-                coords, cycle(initial_resolution), cycle(final_resolution)
-            )
+            int(coord * final_height / initial_height)
+            if i & 1
+            else int(coord * final_width / initial_width)
+            for i, coord in enumerate(coords)
         ]
 
     def rect_scaled_img(
@@ -187,7 +430,14 @@ class ChessGUI:
         """Returns image after scaling it to fit inside Pygame 'Rect' object"""
         img_size = img.get_size()
         scale_args = img_size, [max(img_size)] * 2, map(lambda x: 0.7 * x, rect[2:])
-        return pygame.transform.smoothscale(img, self.scale_coords(*scale_args))
+        width, height = self.scale_coords(*scale_args)
+        size = width, height
+        # Design resolution is fixed, so each image is only ever smoothscaled once
+        if (scaled_img := SCALED_IMAGES.get((img, size))) is None:
+            scaled_img = SCALED_IMAGES[img, size] = pygame.transform.smoothscale(
+                img, size
+            ).convert_alpha()
+        return scaled_img
 
     def scale_widget(
         self, widget: pygame_widgets.widget.WidgetBase, initial: Coord = DISPLAY_SIZE
@@ -199,28 +449,42 @@ class ChessGUI:
             initial,
         )
 
+    def scale_widgets(
+        self,
+        widgets: list[pygame_widgets.widget.WidgetBase],
+        initial: Coord = DISPLAY_SIZE,
+    ) -> None:
+        """Scales the x, y, width, and height attributes of all widgets at once"""
+        if not widgets:
+            return
+        # pylint: disable=protected-access
+        dimensions = np.array(
+            [
+                (widget._x, widget._y, widget._width, widget._height)
+                for widget in widgets
+            ],
+            dtype=np.float64,
+        )
+        scale = np.tile(np.divide(self.display.get_size(), initial), 2)
+        for widget, scaled in zip(widgets, (dimensions * scale).astype(int).tolist()):
+            widget._x, widget._y, widget._width, widget._height = scaled
+
     def draw_button_at_rect(
         self,
+        key: Hashable,
         rect: pygame.rect.Rect,
         image: Optional[pygame.surface.Surface],
         func: Callable[[], Any],
         colour: Optional[str | tuple[int, int, int]] = "BLACK",
         **kwargs,
     ):
-        """Draws button within specified Pygame 'Rect' object"""
+        """Draws button identified by key within specified Pygame 'Rect' object"""
+        button = self.controls.get_button(key, rect, func, colour, **kwargs)
+        button.draw()
         if image is not None:
             image = self.rect_scaled_img(image, rect)
-        button = Button(
-            self.design,
-            *rect,
-            inactiveColour=colour,
-            image=image,
-            onRelease=func,
-            **kwargs,
-        )
-        button.draw()
+            self.design.blit(image, image.get_rect(center=rect.center))
         self.scale_widget(button)
-        self.update()
 
     def draw_button_at_square(
         self, square: Coord, image: Optional[pygame.surface.Surface] = None, **kwargs
@@ -234,7 +498,9 @@ class ChessGUI:
                 if all(0 <= x <= 7 for x in square)
                 else "WHITE"
             )
-        self.draw_button_at_rect(self.design.get_square_rect(square), image, **kwargs)
+        self.draw_button_at_rect(
+            square, self.design.get_square_rect(square), image, **kwargs
+        )
 
     def show_text(
         self,
@@ -247,36 +513,37 @@ class ChessGUI:
         """Displays text of the preconfigured font at the given location"""
         if destination_surface is None:
             destination_surface = self.design.non_board_area
-        resolution = 0.1
-        size = resolution * bisect_right(
-            list(range(1, int(100 / resolution))),
-            rel_width * destination_surface.get_rect().width,
-            key=lambda x: GAME_FONT.get_rect(text, size=x * resolution).width,
+        text_surface = self.render_cache.get_text_surface(
+            text, rel_width * destination_surface.get_width()
         )
-        text_rect = GAME_FONT.get_rect(text, size=size)
-        text_rect.center = tuple(
-            map(mul, (rel_x, rel_y), destination_surface.get_rect()[2:])
+        text_rect = text_surface.get_rect(
+            center=tuple(map(mul, (rel_x, rel_y), destination_surface.get_size()))
         )
-        GAME_FONT.render_to(destination_surface, text_rect, text, "white", size=size)
+        destination_surface.blit(text_surface, text_rect)
         return text_rect
 
-    def draw_pieces(self) -> None:
-        """Draws the pieces at the correct positions on the screen"""
-        # Loops through each row and column, drawing squares and pieces
-        for square in ROWS_AND_COLUMNS:
-            # Draws piece at square if it exists
-            if piece := self.chess.get_piece_at_square(square):
-                colour = (
-                    "red"
-                    if piece == PIECE_OF_SIDE[self.chess.next_side]["K"]
-                    and self.chess.is_check
-                    else self.design.get_square_colour(square)
-                )
-                self.draw_button_at_square(
-                    square=square,
-                    func=partial(self.show_moves, square),
-                    colour=colour,
-                )
+    def draw_pieces(self) -> dict[Coord, Hashable]:
+        """Draws the pieces at the correct positions, returning appearance of squares"""
+        # Loops through occupied squares only, filling squares and registering clicks
+        piece_blits = []
+        square_states: dict[Coord, Hashable] = {}
+        # Finds king to highlight (if any) once rather than for every piece
+        checked_king = (
+            PIECE_OF_SIDE[self.chess.next_side]["K"] if self.chess.is_check else None
+        )
+        get_square_colour = self.design.get_square_colour
+        controls = self.controls
+        for square, piece in self.chess.occupied_squares():
+            colour = "red" if piece == checked_king else get_square_colour(square)
+            rect = self.design.get_square_rect(square)
+            self.design.fill(colour, rect)
+            controls.square_handlers[square] = controls.show_moves_handlers[square]
+            image = self.rect_scaled_img(PIECE_IMAGES[piece], rect)
+            piece_blits.append((image, image.get_rect(center=rect.center)))
+            square_states[square] = piece, colour
+        # Draws all piece images over their squares in a single batch
+        self.design.blits(piece_blits, doreturn=False)
+        return square_states
 
     def draw_players(self) -> None:
         """Draws icons of current player types integrated into button to flip type"""
@@ -289,9 +556,10 @@ class ChessGUI:
                 125 * shift_direction + self.design.non_board_area.get_offset()[0]
             )
             self.draw_button_at_rect(
+                key=side,
                 rect=player_icon_rect,
                 image=PLAYER_ICONS[player][side],
-                func=partial(self.switch_player, side),
+                func=self.controls.switch_player_handlers[side],
                 colour="white",
             )
 
@@ -302,23 +570,27 @@ class ChessGUI:
         rect.centerx += self.design.non_board_area.get_offset()[0]
         rect.centery += 200
         self.draw_button_at_rect(
+            key="RESTART",
             rect=rect,
             image=RESTART_ICON,
-            func=self.restart_game,
+            func=partial(self.load_fen, STARTING_FEN),
             radius=rect.width // 2,
         )
 
-    def restart_game(self) -> None:
-        """Restarts game and updates board"""
-        self.chess = Chess()
+    def load_fen(self, fen: str) -> None:
+        """Replaces chess state with position from FEN, reusing existing GUI"""
+        self.chess = Chess(fen)
+        self.controls.selected_square = None
         self.draw_board()
 
     def draw_board(self) -> None:
         """Displays the current state of the board"""
         self.design.fill("black")
         pygame_widgets.WidgetHandler.getWidgets().clear()
+        self.controls.square_handlers.clear()
+        self.controls.move_squares.clear()
         self.design.draw_board_squares()
-        self.draw_pieces()
+        square_states = self.draw_pieces()
         self.draw_restart_button()
         if self.chess.game_over:
             self.show_text(self.chess.game_over_message)
@@ -326,7 +598,16 @@ class ChessGUI:
             self.show_text(self.display_message)
         else:
             self.draw_players()
-            self.check_engine_move()
+            self.engine.check_engine_move()
+        # Scales only squares whose appearance changed and non-board area to display
+        if self.render_cache.outdated:
+            self.update()
+            self.render_cache.outdated = False
+        else:
+            for square_coords in self.render_cache.changed_squares(square_states):
+                self.update(self.design.get_square_rect(square_coords))
+            self.update(self.design.non_board_rect)
+        self.render_cache.square_states = square_states
 
     def switch_player(self, side: str) -> None:
         """Switches type of player playing for side whose button clicked"""
@@ -335,21 +616,30 @@ class ChessGUI:
         ]
         self.draw_board()
 
-    def draw_move_at_square(self, square: Coord, *args, **kwargs) -> None:
-        """Draws button and circle for move to given square"""
-        self.draw_button_at_square(square, *args, **kwargs)
-        pygame.draw.circle(
-            self.design, MOVE_COLOUR, self.design.get_square_rect(square).center, 15
-        )
+    def draw_move_at_square(
+        self, square: Coord, func: Callable[[], Any]
+    ) -> pygame.Rect:
+        """Draws circle for move to given square, returning changed area"""
+        square_rect = self.design.get_square_rect(square)
+        self.design.fill(self.design.get_square_colour(square), square_rect)
+        if piece := self.chess.get_piece_at_square(square):
+            image = self.rect_scaled_img(PIECE_IMAGES[piece], square_rect)
+            self.design.blit(image, image.get_rect(center=square_rect.center))
+        self.controls.square_handlers[square] = func
+        self.controls.move_squares.append(square)
+        pygame.draw.circle(self.design, MOVE_COLOUR, square_rect.center, 15)
+        self.update(square_rect)
+        self.render_cache.square_states[square] = MOVE_COLOUR
+        return square_rect
 
     def show_moves(self, old_square: Coord) -> None:
         """Display move buttons for clicked piece (double clicking clears moves)"""
         self.draw_board()
 
-        if self.selected_square == old_square:
-            self.selected_square = None
+        if self.controls.selected_square == old_square:
+            self.controls.selected_square = None
         else:
-            self.selected_square = old_square
+            self.controls.selected_square = old_square
             legal_moves = self.chess.legal_moves_from_square(old_square)
             if legal_moves and legal_moves[0].context_flag == "PROMOTION":
                 for promotion_set_i in range(0, len(legal_moves), 4):
@@ -363,69 +653,88 @@ class ChessGUI:
                     self.draw_move_at_square(
                         square=move.new_square, func=partial(self.move_piece, move)
                     )
-        self.update()
 
     def show_promotion_moves(self, promotion_moves: list[Move]):
         """Displays all choices for promoting pawn"""
         self.draw_board()
         for widget in pygame_widgets.WidgetHandler.getWidgets():
             widget.setOnRelease(lambda *args: None)
-        self.show_text("Choose the promotion piece:", rel_y=0.075)
+        self.controls.square_handlers.clear()
+        self.show_text(PROMOTION_MESSAGE, rel_y=0.075)
         for move_i, move in enumerate(promotion_moves):
             self.draw_button_at_square(
                 square=(1, 9 + move_i),
                 image=PIECE_IMAGES[move.context_data],
                 func=partial(self.move_piece, move),
             )
+        self.update(self.design.non_board_rect)
 
     def move_piece(self, move: Move) -> None:
         """Moves piece from one square to another and updates GUI accordingly"""
         self.chess.move_piece(move)
         self.draw_board()
 
-    def engine_move(self) -> None:
-        """Gets the best engine move for the current side"""
-        inital_side = self.chess.next_side
-        self.searching = True
-        best_move = best_engine_move(deepcopy(self.chess), 10000)
-        self.searching = False
-        # Verifies state hasn't changed since move request initiated
-        if (
-            self.chess.next_side == inital_side
-            and self.current_players[inital_side] == "AI"
-        ):
-            self.best_engine_move = best_move
-
-    def check_engine_move(self) -> None:
-        """Checks if it is engine's turn to move, starting move search thread if so"""
-        if (
-            not (self.chess.game_over or self.searching)
-            and self.current_players[self.chess.next_side] == "AI"
-        ):
-            Thread(target=self.engine_move).start()
-
     def mainloop(self, time_limit: int | float = float("inf")) -> None:
         """Keeps GUI running, managing events and buttons, and rendering changes"""
-        time_limit /= 1000
-        start_time = process_time()
-        old_resolution = self.display.get_size()
-        while self.running and (process_time() - start_time) < time_limit:
-            for event in (events := pygame.event.get()):
-                match event.type:
-                    case pygame.VIDEORESIZE:
-                        for widget in pygame_widgets.WidgetHandler.getWidgets():
-                            self.scale_widget(widget, old_resolution)
-                        old_resolution = self.display.get_size()
-                        self.draw_board()
-                    case pygame.QUIT:
-                        self.running = False
-
-            pygame_widgets.update(events)
-            pygame.display.update()
-
-            if self.best_engine_move is not None:
-                self.move_piece(self.best_engine_move)
-                self.best_engine_move = None
+        # Converts time limit (in milliseconds) to deadline in integer nanoseconds
+        deadline_ns = (
+            monotonic_ns() + int(time_limit * 1_000_000)
+            if time_limit != float("inf")
+            else float("inf")
+        )
+        clock = pygame.time.Clock()
+        # Always runs at least one pass so events already queued are handled
+        while self.running:
+            # Sleeps until next event (or timeout, without passing deadline) instead
+            # of spinning when no engine move is pending
+            remaining_ms = max(0, (deadline_ns - monotonic_ns()) / 1_000_000)
+            self.mainloop_once(
+                0 if self.engine.searching else int(min(EVENT_TIMEOUT, remaining_ms))
+            )
+            clock.tick(FRAME_RATE)
+            if monotonic_ns() >= deadline_ns:
+                break
+
+    def mainloop_once(self, timeout: int = 0) -> None:
+        """
+        Handles all queued events in one batch (waiting up to timeout milliseconds for
+        an event if none queued), updating buttons and display
+        """
+        events = pygame.event.get()
+        if not events and timeout > 0:
+            if (event := pygame.event.wait(timeout)).type != pygame.NOEVENT:
+                events = [event] + pygame.event.get()
+        resized = False
+        for event in events:
+            match event.type:
+                case pygame.VIDEORESIZE:
+                    resized = True
+                case pygame.MOUSEBUTTONUP if event.button == pygame.BUTTON_LEFT:
+                    self.controls.click_square(
+                        *self.scale_coords(
+                            event.pos, self.render_cache.display_size, DISPLAY_SIZE
+                        )
+                    )
+                case pygame.WINDOWEXPOSED:
+                    self.render_cache.dirty_rects.append(self.display.get_rect())
+                case pygame.QUIT:
+                    self.running = False
+        # Redraws once for final size if multiple resizes queued (e.g. dragging)
+        if resized:
+            self.scale_widgets(
+                pygame_widgets.WidgetHandler.getWidgets(),
+                self.render_cache.display_size,
+            )
+            self.render_cache.display_size = self.display.get_size()
+            self.render_cache.outdated = True
+            self.draw_board()
+
+        pygame_widgets.update(events)
+        self.render_cache.render_changes(self.display)
+
+        if self.engine.best_move is not None:
+            self.move_piece(self.engine.best_move)
+            self.engine.best_move = None
 
 
 if __name__ == "__main__":
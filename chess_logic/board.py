@@ -4,11 +4,12 @@ state, and executing them on the state
 """
 
 from collections import deque
-from dataclasses import astuple, dataclass
+from dataclasses import dataclass, field
 from itertools import product
-from operator import and_, or_
-from typing import Callable, Optional
+from random import Random
+from typing import Iterator, Optional
 
+import numpy as np
 from numba import njit, types
 
 Bitboard = int
@@ -16,9 +17,25 @@ Coord = tuple[int, int]
 
 PIECES = "KQRBNPkqrbnp"
 SIDES = ["WHITE", "BLACK"]
-OPPOSITE_SIDE = {side: SIDES[(i + 1) % 2] for i, side in enumerate(SIDES)}
+# Sides stored as indices into 'SIDES' (opposite side found via XOR with 1)
+WHITE, BLACK = range(len(SIDES))
 PIECE_SIDE = {piece: SIDES[piece.islower()] for piece in PIECES}
 
+BOARD_NAMES = list(PIECES) + ["GAME"] + SIDES
+BOARD_INDEX = {name: i for i, name in enumerate(BOARD_NAMES)}
+GAME_INDEX = BOARD_INDEX["GAME"]
+PIECE_SIDE_INDEX = {piece: BOARD_INDEX[side] for piece, side in PIECE_SIDE.items()}
+MAILBOX_PIECES = (None,) + tuple(PIECES)
+# Random keys for each piece at each packed square, XORed into Zobrist hash of board
+zobrist_random = Random(0)
+ZOBRIST_KEYS = {
+    piece: [zobrist_random.getrandbits(64) for _ in range(64)] for piece in PIECES
+}
+# Keys for metadata (castling rights by 4-bit value, en passant by bit length)
+ZOBRIST_SIDE = [0, zobrist_random.getrandbits(64)]
+ZOBRIST_CASTLING = [zobrist_random.getrandbits(64) for _ in range(16)]
+ZOBRIST_EN_PASSANT = [0] + [zobrist_random.getrandbits(64) for _ in range(64)]
+
 ROWS_AND_COLUMNS = tuple(product(range(8), range(8)))
 SQUARE_BITBOARD_INDEX = {
     square: (7 - square[0]) * 8 + 7 - square[1] for square in ROWS_AND_COLUMNS
@@ -27,9 +44,20 @@ SQUARE_BITBOARD = {
     square: 1 << index for square, index in SQUARE_BITBOARD_INDEX.items()
 }
 BITBOARD_SQUARE = {bitboard: square for square, bitboard in SQUARE_BITBOARD.items()}
+# Squares indexed by bit index (bit_length() - 1) of single-square bitboard
+BIT_INDEX_SQUARE = [BITBOARD_SQUARE[1 << i] for i in range(64)]
+# Bitboards indexed by packed square (row * 8 + column), avoiding hashing tuple keys
+INDEX_BITBOARD = tuple(map(SQUARE_BITBOARD.get, ROWS_AND_COLUMNS))
 
 STARTING_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
-State = tuple[int | str, ...]
+State = int
+# Expands each digit in FEN positions into that many empty square placeholders
+FEN_EMPTY_SQUARES = str.maketrans({str(empty): "." * empty for empty in range(1, 9)})
+# Maps mailbox piece indices to FEN characters, and runs of empty squares to digits
+MAILBOX_FEN_CHARACTERS = bytes.maketrans(
+    bytes(range(len(MAILBOX_PIECES))), f".{PIECES}".encode()
+)
+FEN_EMPTY_RUNS = [("." * empty, str(empty)) for empty in range(8, 0, -1)]
 
 FEN_TO_BITBOARD_SQUARE = {
     f"{file}{8 - rank_i}": SQUARE_BITBOARD[(rank_i, file_i)]
@@ -41,36 +69,44 @@ BITBOARD_TO_FEN_SQUARE = {
 }
 
 CASTLING_SYMBOLS = "KQkq"
-CastlingRights = dict[str, list[str]]
+# Castling rights stored as 4-bit integer with one bit per symbol
+CastlingRights = int
+CASTLING_BIT = {symbol: 1 << i for i, symbol in enumerate(CASTLING_SYMBOLS)}
+SIDE_CASTLING_SYMBOLS = [
+    [symbol for symbol in CASTLING_SYMBOLS if PIECE_SIDE[symbol] == side]
+    for side in SIDES
+]
+CASTLING_FEN = tuple(
+    "".join(symbol for symbol, bit in CASTLING_BIT.items() if rights & bit) or "-"
+    for rights in range(1 << len(CASTLING_SYMBOLS))
+)
+FEN_CASTLING_RIGHTS = {fen: rights for rights, fen in enumerate(CASTLING_FEN)}
 castling_rook_squares = [
     [(row, column) for column in c] for row in (7, 0) for c in ((7, 5), (0, 3))
 ]
 CASTLING_ROOK_MOVES = dict(zip(CASTLING_SYMBOLS, castling_rook_squares))
-ROOK_SQUARES_VOIDING_CASTLING = {
-    squares[0]: castling for castling, squares in CASTLING_ROOK_MOVES.items()
+# Castling rights voided by any move from or to each packed square (king and rook
+# start squares), as moving or capturing either piece there loses the right
+castling_start_squares = {
+    castling: {rook_square, (rook_square[0], 4)}
+    for castling, (rook_square, _) in CASTLING_ROOK_MOVES.items()
 }
-
-
-def void_castling_by_rook(
-    castling_rights: list[str], rook_square: Coord, lost_castling_rights: list[str]
-) -> None:
-    """Removes castling right voided by rook move/capture if any"""
-    if (right := ROOK_SQUARES_VOIDING_CASTLING.get(rook_square)) in castling_rights:
-        castling_rights.remove(right)
-        lost_castling_rights.append(right)
+SQUARE_VOIDED_CASTLING = [
+    sum(
+        CASTLING_BIT[castling]
+        for castling, squares in castling_start_squares.items()
+        if square in squares
+    )
+    for square in ROWS_AND_COLUMNS
+]
 
 
 UNSIGN_MASK = (1 << 64) - 1
-MAX_BITBOARD = 1 << 64 - 1
-
+# Unsigned complements of 'INDEX_BITBOARD' (avoids negative ints produced by ~)
+INDEX_INVERSE_BITBOARD = tuple(UNSIGN_MASK ^ bitboard for bitboard in INDEX_BITBOARD)
 
-@njit(types.uint64(types.uint64))
-def unsigned_not(board: Bitboard) -> Bitboard:
-    """Returns positive version of boolean NOT of bitboard, enabling use with numba"""
-    return ~board & UNSIGN_MASK
 
-
-@njit(types.uint64(types.uint64), locals=dict(board=types.uint64))
+@njit(types.uint64(types.uint64), locals=dict(board=types.uint64), cache=True)
 def rotate_bitboard(board: Bitboard) -> Bitboard:
     """Reverses single bitboard bitwise"""
     board = ((board & 0x5555555555555555) << 1) | ((board & 0xAAAAAAAAAAAAAAAA) >> 1)
@@ -82,57 +118,67 @@ def rotate_bitboard(board: Bitboard) -> Bitboard:
     return board
 
 
-def swap_halves(data: list, half_length: int) -> list:
-    """Swaps the two halves of a list given half length"""
-    return data[half_length:] + data[half_length:]
+@njit(types.uint64[::1](types.uint64[::1]), cache=True)
+def rotate_bitboards(boards: np.ndarray) -> np.ndarray:
+    """Reverses array of bitboards bitwise in one compiled call"""
+    rotated = np.empty_like(boards)
+    for i, board in enumerate(boards):
+        rotated[i] = rotate_bitboard(board)
+    return rotated
+
+
+# Reorders numeric representation (12 pieces, en passant, 4 castling rights) when
+# black to move, repeating black's pieces and castling rights in both halves as
+# saved genomes were trained on this layout (changing it requires retraining)
+BLACK_INPUT_ORDER = np.array(
+    [*range(6, 12), *range(6, 12), 12, 15, 16, 15, 16], dtype=np.intp
+)
 
 
-@dataclass
+@njit(types.uint64[::1](types.uint64[::1], types.boolean), cache=True)
+def encode_numeric_repr(numeric_repr: np.ndarray, black: bool) -> np.ndarray:
+    """Orients numeric representation to perspective of black if black to move"""
+    if black:
+        numeric_repr = numeric_repr[BLACK_INPUT_ORDER]
+        numeric_repr[:12] = rotate_bitboards(numeric_repr[:12])
+    return numeric_repr
+
+
+@dataclass(slots=True)
 class BoardMetadata:
     """Dataclass storing metadata associated with a board state"""
 
-    next_side: str
+    next_side: int
     fen_castling: str
     fen_en_passant_square: str
     half_move_clock: int
     move_number: int
+    castling_rights: CastlingRights = field(init=False)
+    en_passant_bitboard: Bitboard = field(init=False)
+    previous_states: deque[Optional[State]] = field(init=False)
 
     def __post_init__(self) -> None:
         """Alters fen values  to represent data in more suitable forms"""
-        self.next_side = SIDES["wb".index(self.next_side)]
-        self.side_castling_rights = {
-            side: [
-                symbol
-                for symbol in self.fen_castling
-                if symbol != "-" and PIECE_SIDE[symbol] == side
-            ]
-            for side in SIDES
-        }
+        self.next_side = "wb".index(self.next_side)  # type: ignore[arg-type]
+        self.castling_rights = FEN_CASTLING_RIGHTS[self.fen_castling]
         self.en_passant_bitboard = FEN_TO_BITBOARD_SQUARE[self.fen_en_passant_square]
-        if self.en_passant_bitboard and self.next_side == "BLACK":
+        if self.en_passant_bitboard and self.next_side == BLACK:
             self.en_passant_bitboard = rotate_bitboard(self.en_passant_bitboard)
-        self.previous_states: deque[Optional[State]] = deque([None] * 20, maxlen=20)
+        self.previous_states = deque([None] * 20, maxlen=20)
 
     @property
     def fen_metadata(self) -> str:
         """Returns fen representation of metadata"""
-        self.fen_castling = (
-            "".join(sorted(sum(rights, [])))
-            if any(rights := self.side_castling_rights.values())
-            else "-"
-        )
+        self.fen_castling = CASTLING_FEN[self.castling_rights]
         self.fen_en_passant_square = BITBOARD_TO_FEN_SQUARE[
             rotate_bitboard(self.en_passant_bitboard)
-            if self.next_side == "BLACK"
+            if self.next_side == BLACK
             else self.en_passant_bitboard
         ]
-        metadata = tuple(map(str, astuple(self)))
-        return " ".join((metadata[0][0].lower(),) + metadata[1:])
-
-    @property
-    def repetition_metadata(self) -> tuple:
-        """Returns tuple containing metadata necessary to check repetition"""
-        return self.next_side, self.side_castling_rights, self.en_passant_bitboard
+        return (
+            f"{'wb'[self.next_side]} {self.fen_castling} "
+            f"{self.fen_en_passant_square} {self.half_move_clock} {self.move_number}"
+        )
 
     def update_metadata(
         self,
@@ -144,43 +190,26 @@ class BoardMetadata:
         previous_state: State,
     ) -> tuple[CastlingRights, State]:
         """Updates board metadata after move"""
-        moved_piece = moved_piece.upper()
-        # Updates castling rights
-        castling_rights_lost: CastlingRights = {side: [] for side in SIDES}
-        if next_side_castling_rights := self.side_castling_rights[self.next_side]:
-            next_side_castling_rights_lost = castling_rights_lost[self.next_side]
-            match moved_piece:
-                case "K":
-                    next_side_castling_rights_lost.extend(next_side_castling_rights)
-                    next_side_castling_rights.clear()
-                case "R":
-                    void_castling_by_rook(
-                        next_side_castling_rights,
-                        old_square,
-                        next_side_castling_rights_lost,
-                    )
+        # Updates castling rights (covers king/rook moves and rook captures)
+        castling_rights_lost = self.castling_rights & (
+            SQUARE_VOIDED_CASTLING[old_square[0] * 8 + old_square[1]]
+            | SQUARE_VOIDED_CASTLING[new_square[0] * 8 + new_square[1]]
+        )
+        self.castling_rights ^= castling_rights_lost
 
         # Updates remaining metadata
-        self.next_side = OPPOSITE_SIDE[self.next_side]
+        self.next_side ^= 1
         self.en_passant_bitboard = en_passant_bitboard
         self.half_move_clock = (
             0
-            if moved_piece == "P" or captured_piece is not None
+            if moved_piece in "Pp" or captured_piece is not None
             else self.half_move_clock + 1
         )
-        self.move_number += self.next_side == "WHITE"
+        self.move_number += self.next_side == WHITE
 
         # Update previous fens for twofold repetition
         state_lost = self.previous_states[0]
         self.previous_states.append(previous_state)
-
-        # Removes castling right of new side to move if relevant rook just captured
-        if captured_piece is not None and captured_piece.upper() == "R":
-            void_castling_by_rook(
-                self.side_castling_rights[self.next_side],
-                new_square,
-                castling_rights_lost[self.next_side],
-            )
         return castling_rights_lost, state_lost
 
     def undo_metadata_update(
@@ -189,17 +218,14 @@ class BoardMetadata:
         old_en_passant_bitboard: Bitboard,
         castling_rights_lost: CastlingRights,
         state_lost: State,
-    ) -> State:
+    ) -> None:
         """Undos update board metadata after move"""
         self.half_move_clock = old_half_move_clock
-        self.move_number -= self.next_side == "WHITE"
-        self.next_side = OPPOSITE_SIDE[self.next_side]
+        self.move_number -= self.next_side == WHITE
+        self.next_side ^= 1
         self.en_passant_bitboard = old_en_passant_bitboard
-        for side, rights_lost in castling_rights_lost.items():
-            self.side_castling_rights[side].extend(rights_lost)
-        previous_state = self.previous_states[-1]
+        self.castling_rights |= castling_rights_lost
         self.previous_states.appendleft(state_lost)
-        return previous_state
 
 
 class ChessBoard(BoardMetadata):
@@ -209,6 +235,8 @@ class ChessBoard(BoardMetadata):
         - Generates legal moves from positions
     """
 
+    __slots__ = ("boards", "mailbox", "zobrist_key")
+
     def __init__(self, fen: str) -> None:
         """
         Initialises chess state from standard starting position or from optional
@@ -218,101 +246,133 @@ class ChessBoard(BoardMetadata):
         super().__init__(
             *metadata[:3], *map(int, metadata[-2:])  # type: ignore[arg-type]
         )
-        self.cached_state: Optional[State] = None
         self.fen_positions_to_bitboards(fen_positions)
 
     def fen_positions_to_bitboards(self, fen_positions: str) -> None:
         """
-        Store piece positions obtained from positions portion of FEN as dictionary with
-        key for each piece and game as a whole and values as bitboard for given piece
+        Store piece positions obtained from positions portion of FEN as list with
+        bitboard for each piece, game as a whole and side (indexed by 'BOARD_INDEX')
         """
-        # Initialize 'self.boards' dictionary with empty board for each piece key
-        self.boards = dict.fromkeys(list(PIECES) + ["GAME"] + SIDES, 0)
+        # Initialize 'self.boards' list with empty board for each piece, game and side
+        self.boards = [0] * len(BOARD_NAMES)
+        # Stores piece at each square by 'MAILBOX_PIECES' index (0 if square empty)
+        self.mailbox = bytearray(64)
+        self.zobrist_key = 0
 
         # Calculate integer representing bitboard for each piece and whole game from FEN
-        for row_i, row in enumerate(fen_positions.split("/")):
-            column_i = 0
-            for piece in row:
-                if piece.isnumeric():
-                    column_i += int(piece)
-                else:
-                    self.add_bitboard_square(piece, (row_i, column_i))
-                    column_i += 1
+        squares = fen_positions.replace("/", "").translate(FEN_EMPTY_SQUARES)
+        for square, piece in zip(ROWS_AND_COLUMNS, squares):
+            if piece != ".":
+                self.add_bitboard_square(piece, square)
 
     @property
     def fen(self) -> str:
         """Returns the FEN of the current board state"""
-        rows = []
-        for row_i in range(8):
-            row = ""
-            empty_spaces = 0
-            for column_i in range(8):
-                if piece := self.get_piece_at_square((row_i, column_i)):
-                    if empty_spaces:
-                        row += str(empty_spaces)
-                    row += piece
-                    empty_spaces = 0
-                else:
-                    empty_spaces += 1
-            if empty_spaces:
-                row += str(empty_spaces)
-            rows.append(row)
-
-        return f"{'/'.join(rows)} {self.fen_metadata}"
+        # Translates whole mailbox to characters at once, then collapses empty runs
+        squares = self.mailbox.translate(MAILBOX_FEN_CHARACTERS).decode()
+        positions = "/".join([squares[start : start + 8] for start in range(0, 64, 8)])
+        for empty_run, empty_digit in FEN_EMPTY_RUNS:
+            positions = positions.replace(empty_run, empty_digit)
+        return f"{positions} {self.fen_metadata}"
 
     @property
     def numeric_repr(self) -> list[int]:
         """Returns list containing numeric representations of relevant state portions"""
         castling_rights = [
-            int(right in self.side_castling_rights[PIECE_SIDE[right]])
-            for right in CASTLING_SYMBOLS
+            self.castling_rights >> i & 1 for i in range(len(CASTLING_SYMBOLS))
         ]
-        bitboards = list(self.boards.values())[:12]
-        if self.next_side == "BLACK":
-            castling_rights = swap_halves(castling_rights, 2)
-            bitboards = list(map(rotate_bitboard, swap_halves(bitboards, 6)))
-        return bitboards + [self.en_passant_bitboard] + castling_rights
+        numeric_repr = self.boards[:12] + [self.en_passant_bitboard] + castling_rights
+        return encode_numeric_repr(
+            np.array(numeric_repr, dtype=np.uint64), self.next_side == BLACK
+        ).tolist()
 
     @property
     def current_state(self) -> State:
-        """Returns representation of current state used for checking repetition"""
-        if self.cached_state is None:
-            self.cached_state = tuple(self.boards.values()) + self.repetition_metadata
-        return self.cached_state
+        """Returns Zobrist hash of current state used for checking repetition"""
+        return (
+            self.zobrist_key
+            ^ ZOBRIST_SIDE[self.next_side]
+            ^ ZOBRIST_CASTLING[self.castling_rights]
+            ^ ZOBRIST_EN_PASSANT[self.en_passant_bitboard.bit_length()]
+        )
 
     def piece_exists_at_square(self, square: Coord, piece: str) -> bool:
         """Checks whether piece exists at square for given board"""
-        return bool(self.boards[piece] & SQUARE_BITBOARD[square])
+        row, column = square
+        return bool(self.boards[BOARD_INDEX[piece]] & INDEX_BITBOARD[row * 8 + column])
 
     def get_piece_at_square(self, square: Coord) -> Optional[str]:
         """Returns piece at square on chess board if there is one and 'None' if not"""
-        if self.piece_exists_at_square(square, "GAME"):
-            for piece in PIECES:
-                if self.piece_exists_at_square(square, piece):
-                    return piece
-        return None
-
-    def edit_bitboard(
-        self, piece: str, mask: int, command: Callable[[Bitboard, Bitboard], Bitboard]
-    ):
-        """
-        Edits all bitboards requiring editing when moving piece by applying given
-        function between bitboard and mask at index
-        """
-        for bitboard in (piece, PIECE_SIDE[piece], "GAME"):
-            self.boards[bitboard] = command(self.boards[bitboard], mask)
+        row, column = square
+        return MAILBOX_PIECES[self.mailbox[row * 8 + column]]
+
+    def occupied_squares(self) -> Iterator[tuple[Coord, str]]:
+        """Yields square and piece for each occupied square on chess board"""
+        for piece, bitboard in zip(PIECES, self.boards):
+            while bitboard:
+                piece_mask = bitboard & -bitboard
+                yield BIT_INDEX_SQUARE[piece_mask.bit_length() - 1], piece
+                bitboard ^= piece_mask
 
     def add_bitboard_square(self, piece: str, square: Coord) -> None:
         """Adds piece presence to required bitboards (changes square bit to 1)"""
-        self.edit_bitboard(piece, SQUARE_BITBOARD[square], or_)
+        row, column = square
+        index = row * 8 + column
+        mask, boards = INDEX_BITBOARD[index], self.boards
+        piece_index = BOARD_INDEX[piece]
+        boards[piece_index] |= mask
+        boards[PIECE_SIDE_INDEX[piece]] |= mask
+        boards[GAME_INDEX] |= mask
+        self.mailbox[index] = piece_index + 1
+        self.zobrist_key ^= ZOBRIST_KEYS[piece][index]
 
     def remove_bitboard_square(self, piece: str, square: Coord) -> None:
         """Removes piece presence from required bitboards (changes square bit to 0)"""
-        self.edit_bitboard(piece, unsigned_not(SQUARE_BITBOARD[square]), and_)
+        row, column = square
+        index = row * 8 + column
+        mask, boards = INDEX_INVERSE_BITBOARD[index], self.boards
+        boards[BOARD_INDEX[piece]] &= mask
+        boards[PIECE_SIDE_INDEX[piece]] &= mask
+        boards[GAME_INDEX] &= mask
+        self.mailbox[index] = 0
+        self.zobrist_key ^= ZOBRIST_KEYS[piece][index]
 
     def move_piece_bitboard_square(
         self, piece: str, old_square: Coord, new_square: Coord
     ) -> None:
         """Changes square at which presence of piece shown in relevant bitboards"""
-        self.remove_bitboard_square(piece, old_square)
-        self.add_bitboard_square(piece, new_square)
+        # Toggles both squares with one XOR (new square must already be empty)
+        old_index = old_square[0] * 8 + old_square[1]
+        new_index = new_square[0] * 8 + new_square[1]
+        mask = INDEX_BITBOARD[old_index] | INDEX_BITBOARD[new_index]
+        boards = self.boards
+        boards[BOARD_INDEX[piece]] ^= mask
+        boards[PIECE_SIDE_INDEX[piece]] ^= mask
+        boards[GAME_INDEX] ^= mask
+        mailbox = self.mailbox
+        mailbox[new_index], mailbox[old_index] = mailbox[old_index], 0
+        piece_keys = ZOBRIST_KEYS[piece]
+        self.zobrist_key ^= piece_keys[old_index] ^ piece_keys[new_index]
+
+    def capture_piece_bitboard_square(
+        self, piece: str, captured_piece: str, old_square: Coord, new_square: Coord
+    ) -> None:
+        """Moves piece onto square of captured piece, removing captured piece"""
+        # Game board only loses old square (new square remains occupied)
+        old_index = old_square[0] * 8 + old_square[1]
+        new_index = new_square[0] * 8 + new_square[1]
+        old_mask, new_mask = INDEX_BITBOARD[old_index], INDEX_BITBOARD[new_index]
+        boards = self.boards
+        boards[BOARD_INDEX[piece]] ^= old_mask | new_mask
+        boards[PIECE_SIDE_INDEX[piece]] ^= old_mask | new_mask
+        boards[BOARD_INDEX[captured_piece]] ^= new_mask
+        boards[PIECE_SIDE_INDEX[captured_piece]] ^= new_mask
+        boards[GAME_INDEX] ^= old_mask
+        mailbox = self.mailbox
+        mailbox[new_index], mailbox[old_index] = mailbox[old_index], 0
+        piece_keys = ZOBRIST_KEYS[piece]
+        self.zobrist_key ^= (
+            piece_keys[old_index]
+            ^ piece_keys[new_index]
+            ^ ZOBRIST_KEYS[captured_piece][new_index]
+        )
@@ -2,17 +2,29 @@
 
 from __future__ import annotations
 
-from typing import Any, NamedTuple, Optional
+from itertools import chain
+from typing import Any, Iterator, NamedTuple, Optional
 
 from chess_logic.board import (
-    OPPOSITE_SIDE,
+    SIDES,
     STARTING_FEN,
     Bitboard,
     CastlingRights,
     Coord,
     State,
 )
-from chess_logic.move_generation import PIECE_OF_SIDE, Move, MoveGenerator, Moves
+from chess_logic.move_generation import (
+    PIECE_OF_SIDE,
+    Move,
+    MoveGenerator,
+    Moves,
+    PseudoMove,
+)
+
+# Pawn and rook of each side (indexed by side) for special move handling
+SIDE_PAWN = [side_pieces["P"] for side_pieces in PIECE_OF_SIDE]
+SIDE_ROOK = [side_pieces["R"] for side_pieces in PIECE_OF_SIDE]
+SPECIAL_MOVE_FLAGS = frozenset(("DOUBLE PUSH", "CASTLING", "PROMOTION", "EN PASSANT"))
 
 
 class PerformedMove(NamedTuple):
@@ -23,7 +35,7 @@ class PerformedMove(NamedTuple):
     context_flag: Optional[str]
     context_data: Any
     captured_piece: Optional[str]
-    old_legal_moves: Moves
+    old_legal_moves: Optional[Moves]
     old_half_move_clock: int
     old_en_passant_bitboard: Bitboard
     castling_rights_lost: CastlingRights
@@ -33,27 +45,52 @@ class PerformedMove(NamedTuple):
 class Chess(MoveGenerator):
     """Provides full handling of chess state"""
 
+    __slots__ = (
+        "game_over",
+        "winner",
+        "game_over_message",
+        "cached_legal_moves",
+        "pending_legal_moves",
+        "legal_moves_by_square",
+    )
+
     def __init__(self, fen: str = STARTING_FEN) -> None:
         super().__init__(fen)
         self.game_over = False
         self.winner: Optional[str] = None
         self.game_over_message: Optional[str] = None
+        # Legal moves cached per state, generated partially until accessed in full
+        self.cached_legal_moves: Optional[Moves] = None
+        self.pending_legal_moves: Optional[Iterator[PseudoMove]] = None
+        self.legal_moves_by_square: Optional[dict[Coord, list[Move]]] = None
         self.update_board_state()
 
-    def update_board_state(
-        self, legal_moves: Optional[Moves] = None, state: Optional[State] = None
-    ) -> None:
-        """Performs necessary updates when board state changed"""
-        self.current_legal_moves = (
-            legal_moves if legal_moves is not None else self.legal_moves()
+    def __getstate__(self) -> tuple[None, dict[str, Any]]:
+        """Returns slot values for copying/pickling (pending generator uncopyable)"""
+        slots = chain.from_iterable(
+            getattr(cls, "__slots__", ()) for cls in type(self).__mro__
         )
-        self.cached_state = state
+        state = {slot: getattr(self, slot) for slot in slots if hasattr(self, slot)}
+        state["cached_legal_moves"] = self.current_legal_moves
+        state["pending_legal_moves"] = None
+        return None, state
+
+    def update_board_state(self, legal_moves: Optional[Moves] = None) -> None:
+        """Performs necessary updates when board state changed"""
+        self.cached_legal_moves = legal_moves
+        self.pending_legal_moves = None
+        self.legal_moves_by_square = None
+        if legal_moves is None:
+            # Generates first legal move only, resuming when moves accessed in full
+            generated_moves = self.generate_legal_moves()
+            if (first_move := next(generated_moves, None)) is not None:
+                self.pending_legal_moves = chain((first_move,), generated_moves)
 
         self.game_over = True
         self.winner = None
-        if not self.current_legal_moves:
+        if not (legal_moves or self.pending_legal_moves):
             if self.is_check:
-                self.winner = OPPOSITE_SIDE[self.next_side]
+                self.winner = SIDES[self.next_side ^ 1]
                 self.game_over_message = f"{self.winner.title()} wins by checkmate"
             else:
                 self.game_over_message = "Draw by stalemate"
@@ -65,42 +102,57 @@ class Chess(MoveGenerator):
             self.game_over = False
 
         if self.game_over:
-            self.current_legal_moves = ()
+            self.cached_legal_moves = ()
+            self.pending_legal_moves = None
+
+    @property
+    def current_legal_moves(self) -> Moves:
+        """Returns legal moves in current state (generated once per state on demand)"""
+        if self.cached_legal_moves is None:
+            self.cached_legal_moves = self.legal_moves(self.pending_legal_moves)
+            self.pending_legal_moves = None
+        return self.cached_legal_moves
 
     def legal_moves_from_square(self, square: Coord) -> list[Move]:
-        """Returns all legal moves from specific square on board"""
-        return [move for move in self.current_legal_moves if move.old_square == square]
+        """Returns legal moves from square (grouping moves by square once per state)"""
+        if self.legal_moves_by_square is None:
+            self.legal_moves_by_square = {}
+            for move in self.current_legal_moves:
+                self.legal_moves_by_square.setdefault(move.old_square, []).append(move)
+        return self.legal_moves_by_square.get(square, [])
 
     def move_piece(self, move: Move, update: bool = True) -> PerformedMove:
         """Moves piece at given square to new square, returning new chess state"""
+        # State stored for repetition checks must be read before the board changes
+        previous_state = self.current_state
+        moved_piece = self.get_piece_at_square(move.old_square)
         if captured_piece := self.get_piece_at_square(move.new_square):
-            self.remove_bitboard_square(captured_piece, move.new_square)
-        self.move_piece_bitboard_square(
-            moved_piece := self.get_piece_at_square(move.old_square),
-            move.old_square,
-            move.new_square,
-        )
+            self.capture_piece_bitboard_square(moved_piece, captured_piece, *move[:2])
+        else:
+            self.move_piece_bitboard_square(moved_piece, *move[:2])
 
         en_passant_bitboard = 0
-        match move.context_flag:
-            case "PROMOTION":
-                self.remove_bitboard_square(
-                    PIECE_OF_SIDE[self.next_side]["P"], move.new_square
-                )
-                self.add_bitboard_square(move.context_data, move.new_square)
-            case "EN PASSANT":
-                self.remove_bitboard_square(
-                    PIECE_OF_SIDE[OPPOSITE_SIDE[self.next_side]]["P"],
-                    move.context_data[1],
-                )
-            case "DOUBLE PUSH":
-                en_passant_bitboard = move.context_data
-            case "CASTLING":
-                self.move_piece_bitboard_square(
-                    PIECE_OF_SIDE[self.next_side]["R"], *move.context_data
-                )
-
-        old_legal_moves = self.current_legal_moves
+        # Only special moves checked against each flag (most moves are ordinary)
+        if (context_flag := move.context_flag) in SPECIAL_MOVE_FLAGS:
+            match context_flag:
+                case "DOUBLE PUSH":
+                    en_passant_bitboard = move.context_data
+                case "CASTLING":
+                    self.move_piece_bitboard_square(
+                        SIDE_ROOK[self.next_side], *move.context_data
+                    )
+                case "PROMOTION":
+                    self.remove_bitboard_square(
+                        SIDE_PAWN[self.next_side], move.new_square
+                    )
+                    self.add_bitboard_square(move.context_data, move.new_square)
+                case "EN PASSANT":
+                    self.remove_bitboard_square(
+                        SIDE_PAWN[self.next_side ^ 1],
+                        move.context_data[1],
+                    )
+
+        old_legal_moves = self.cached_legal_moves
         old_half_move_clock = self.half_move_clock
         old_en_passant_bitboard = self.en_passant_bitboard
         castling_rights_lost, state_lost = self.update_metadata(
@@ -108,10 +160,13 @@ class Chess(MoveGenerator):
             en_passant_bitboard,
             moved_piece,
             captured_piece,
-            self.current_state,
+            previous_state,
         )
         if update:
             self.update_board_state()
+        else:
+            self.cached_legal_moves = self.pending_legal_moves = None
+            self.legal_moves_by_square = None
         return PerformedMove(
             *move,
             captured_piece,
@@ -124,7 +179,7 @@ class Chess(MoveGenerator):
 
     def undo_move(self, performed_move: PerformedMove, update: bool = True) -> None:
         """Reverts chess state back to what it was before move"""
-        previous_state = self.undo_metadata_update(*performed_move[-4:])
+        self.undo_metadata_update(*performed_move[-4:])
         self.move_piece_bitboard_square(
             self.get_piece_at_square(performed_move.new_square),
             performed_move.new_square,
@@ -133,24 +188,28 @@ class Chess(MoveGenerator):
         if (captured_piece := performed_move.captured_piece) is not None:
             self.add_bitboard_square(captured_piece, performed_move.new_square)
 
-        match performed_move.context_flag:
-            case "PROMOTION":
-                self.remove_bitboard_square(
-                    performed_move.context_data, performed_move.old_square
-                )
-                self.add_bitboard_square(
-                    PIECE_OF_SIDE[self.next_side]["P"], performed_move.old_square
-                )
-            case "EN PASSANT":
-                self.add_bitboard_square(
-                    PIECE_OF_SIDE[OPPOSITE_SIDE[self.next_side]]["P"],
-                    performed_move.context_data[1],
-                )
-            case "CASTLING":
-                self.move_piece_bitboard_square(
-                    PIECE_OF_SIDE[self.next_side]["R"],
-                    *reversed(performed_move.context_data),
-                )
+        if (context_flag := performed_move.context_flag) in SPECIAL_MOVE_FLAGS:
+            match context_flag:
+                case "CASTLING":
+                    self.move_piece_bitboard_square(
+                        SIDE_ROOK[self.next_side],
+                        *reversed(performed_move.context_data),
+                    )
+                case "PROMOTION":
+                    self.remove_bitboard_square(
+                        performed_move.context_data, performed_move.old_square
+                    )
+                    self.add_bitboard_square(
+                        SIDE_PAWN[self.next_side], performed_move.old_square
+                    )
+                case "EN PASSANT":
+                    self.add_bitboard_square(
+                        SIDE_PAWN[self.next_side ^ 1],
+                        performed_move.context_data[1],
+                    )
 
         if update:
-            self.update_board_state(performed_move.old_legal_moves, previous_state)
+            self.update_board_state(performed_move.old_legal_moves)
+        else:
+            self.cached_legal_moves = self.pending_legal_moves = None
+            self.legal_moves_by_square = None
@@ -7,34 +7,38 @@ from typing import Any, Callable, Iterator, NamedTuple, Optional
 from numba import njit, types
 
 from chess_logic.board import (
-    BITBOARD_SQUARE,
+    BIT_INDEX_SQUARE,
     BITBOARD_TO_FEN_SQUARE,
+    BLACK,
+    BOARD_NAMES,
+    CASTLING_BIT,
     CASTLING_ROOK_MOVES,
     CASTLING_SYMBOLS,
-    OPPOSITE_SIDE,
     PIECE_SIDE,
     PIECES,
     ROWS_AND_COLUMNS,
+    SIDE_CASTLING_SYMBOLS,
     SIDES,
     SQUARE_BITBOARD,
+    UNSIGN_MASK,
     Bitboard,
     ChessBoard,
     Coord,
     rotate_bitboard,
-    unsigned_not,
 )
 
 Bitboards = dict[str, Bitboard]
 Context = tuple[str, Any]
 
-PIECE_OF_SIDE = {
-    side: {piece.upper(): piece for piece in PIECES if PIECE_SIDE[piece] == side}
+PIECE_OF_SIDE = [
+    {piece.upper(): piece for piece in PIECES if PIECE_SIDE[piece] == side}
     for side in SIDES
-}
+]
 STANDARD_PIECES = PIECES[:6]
-PROMOTION_PIECES = {
-    side: "".join(map(PIECE_OF_SIDE[side].get, STANDARD_PIECES[1:-1])) for side in SIDES
-}
+PROMOTION_PIECES = [
+    "".join(map(side_pieces.get, STANDARD_PIECES[1:-1]))
+    for side_pieces in PIECE_OF_SIDE
+]
 
 RANK0 = 2**8 - 1
 RANKS = [RANK0] + [RANK0 << i for i in range(8, 64, 8)]
@@ -114,13 +118,13 @@ def total_slider_moves(
     )
 
 
-@njit
+@njit(cache=True)
 def lsb(bitboard: Bitboard) -> Bitboard:
     """Returns bitboard representing lowest set bit in given bitboard"""
     return bitboard & -bitboard
 
 
-@njit
+@njit(cache=True)
 def msb(bitboard: Bitboard) -> Bitboard:
     """Returns bitboard representing highest set bit in given bitboard"""
     shift = 1
@@ -130,7 +134,7 @@ def msb(bitboard: Bitboard) -> Bitboard:
     return (bitboard >> 1) + 1
 
 
-@njit(types.void(types.uint64))
+@njit(types.void(types.uint64), cache=True)
 def bitboard_piece_masks(bitboard: Bitboard) -> Iterator[Bitboard]:
     """Yields all piece masks (bitboard representing one piece) in given bitboard"""
     while bitboard:
@@ -164,7 +168,9 @@ KING_ATTACK_PATH = {
 }
 
 
-@njit(types.UniTuple(types.uint64, 2)(types.int8, types.uint64, types.uint64))
+@njit(
+    types.UniTuple(types.uint64, 2)(types.int8, types.uint64, types.uint64), cache=True
+)
 def king_attacker_and_path_in_direction(
     shift: int, attacker_path: Bitboard, attackers: Bitboard
 ) -> tuple[Bitboard, Bitboard]:
@@ -203,12 +209,11 @@ POSSIBLE_ATTACKERS |= {shift: ["r", "q"] for shift in ROOK_SHIFTS}
 
 BITBOARD_INDEX = {1 << i: i for i in range(64)}
 POSSIBLE_PIN_SHIFTS = sorted(KING_SHIFTS.keys(), reverse=True)[:4]
-REVERSED_BITBOARD = {1 << i: 1 << 63 - i for i in range(64)}
 
 
 def shift_direction(old: Bitboard, new: Bitboard, signed: bool = False) -> int:
     """Returns core bitboard shift by which new square moved to from old"""
-    difference = BITBOARD_INDEX[new] - BITBOARD_INDEX[old]
+    difference = new.bit_length() - old.bit_length()
     for shift in POSSIBLE_PIN_SHIFTS:
         if difference % shift == 0:
             return shift if not signed or difference > 0 else -shift
@@ -230,20 +235,20 @@ CASTLING_CLEAR_BITBOARD = {
 
 NON_SLIDERS = "KN"
 KING_MASKS = {
-    +8 + 1: unsigned_not(RANKS[7] | FILES[7]),
-    +8 + 0: unsigned_not(RANKS[7]),
-    +8 - 1: unsigned_not(RANKS[7] | FILES[0]),
-    +0 + 1: unsigned_not(FILES[7]),
-    +0 - 1: unsigned_not(FILES[0]),
-    -8 + 1: unsigned_not(RANKS[0] | FILES[7]),
-    -8 + 0: unsigned_not(RANKS[0]),
-    -8 - 1: unsigned_not(RANKS[0] | FILES[0]),
+    +8 + 1: UNSIGN_MASK ^ (RANKS[7] | FILES[7]),
+    +8 + 0: UNSIGN_MASK ^ RANKS[7],
+    +8 - 1: UNSIGN_MASK ^ (RANKS[7] | FILES[0]),
+    +0 + 1: UNSIGN_MASK ^ FILES[7],
+    +0 - 1: UNSIGN_MASK ^ FILES[0],
+    -8 + 1: UNSIGN_MASK ^ (RANKS[0] | FILES[7]),
+    -8 + 0: UNSIGN_MASK ^ RANKS[0],
+    -8 - 1: UNSIGN_MASK ^ (RANKS[0] | FILES[0]),
 }
 KNIGHT_FORWARD_MASKS = {
-    1 * 8 + 2: unsigned_not(RANKS[7] | sum(FILES[6:])),
-    1 * 8 - 2: unsigned_not(RANKS[7] | sum(FILES[:2])),
-    2 * 8 + 1: unsigned_not(sum(RANKS[6:]) | FILES[7]),
-    2 * 8 - 1: unsigned_not(sum(RANKS[6:]) | FILES[0]),
+    1 * 8 + 2: UNSIGN_MASK ^ (RANKS[7] | sum(FILES[6:])),
+    1 * 8 - 2: UNSIGN_MASK ^ (RANKS[7] | sum(FILES[:2])),
+    2 * 8 + 1: UNSIGN_MASK ^ (sum(RANKS[6:]) | FILES[7]),
+    2 * 8 - 1: UNSIGN_MASK ^ (sum(RANKS[6:]) | FILES[0]),
 }
 KNIGHT_MASKS = KNIGHT_FORWARD_MASKS | {
     -shift: rotate_bitboard(mask) for shift, mask in KNIGHT_FORWARD_MASKS.items()
@@ -320,6 +325,16 @@ Moves = tuple[Move, ...]
 class MoveGenerator(ChessBoard):
     """Handles all move generation for current chess state"""
 
+    __slots__ = (
+        "move_functions_and_pieces",
+        "is_check",
+        "promotion",
+        "rotate",
+        "move_boards",
+        "knight_attacks",
+        "total_knight_attacks",
+    )
+
     def __init__(self, fen: str) -> None:
         super().__init__(fen)
         move_functions = (
@@ -336,38 +351,42 @@ class MoveGenerator(ChessBoard):
 
     def move_bitboard_to_square(self, move_bitboard: Bitboard) -> Coord:
         """Returns coordinates of square given bitboard index (rotated for black)"""
-        return BITBOARD_SQUARE[
-            REVERSED_BITBOARD[move_bitboard] if self.rotate else move_bitboard
-        ]
-
-    def legal_moves(self) -> Moves:
-        """Returns a tuple of all legal moves in current board state"""
+        bit_index = move_bitboard.bit_length() - 1
+        return BIT_INDEX_SQUARE[63 - bit_index if self.rotate else bit_index]
+
+    def legal_moves(
+        self, generated_moves: Optional[Iterator[PseudoMove]] = None
+    ) -> Moves:
+        """Returns a tuple of all legal moves (or those remaining in given generator)"""
+        if generated_moves is None:
+            generated_moves = self.generate_legal_moves()
         return tuple(
             Move(
                 *map(self.move_bitboard_to_square, move[:2]), *move[2:]  # type: ignore
             )
-            for move in self.generate_legal_moves()
+            for move in generated_moves
         )
 
     def generate_legal_moves(self) -> Iterator[PseudoMove]:
         """Yields all legal moves for all pieces in current board state"""
-        self.rotate = self.next_side == "BLACK"
+        self.rotate = self.next_side == BLACK
+        next_side, opposite_side = SIDES[self.next_side], SIDES[self.next_side ^ 1]
 
         # Orients bitboards for move generation (upper case piece represents next side)
         self.move_boards = self.oriented_bitboards(
             {
                 (
                     piece.upper()
-                    if len(piece) != 1 or PIECE_SIDE[piece] == self.next_side
+                    if len(piece) != 1 or PIECE_SIDE[piece] == next_side
                     else piece.lower()
                 ): bitboard
-                for piece, bitboard in self.boards.items()
+                for piece, bitboard in zip(BOARD_NAMES, self.boards)
             }
         )
         self.move_boards["~GAME"] = ~self.move_boards["GAME"]
-        self.move_boards["SAME"] = self.move_boards[self.next_side]
+        self.move_boards["SAME"] = self.move_boards[next_side]
         self.move_boards["~SAME"] = ~self.move_boards["SAME"]
-        self.move_boards["OPPOSITE"] = self.move_boards[OPPOSITE_SIDE[self.next_side]]
+        self.move_boards["OPPOSITE"] = self.move_boards[opposite_side]
 
         king_bitboard = self.move_boards["K"]
         self.move_boards["NO KING GAME"] = self.move_boards["GAME"] & ~king_bitboard
@@ -520,9 +539,9 @@ class MoveGenerator(ChessBoard):
 
     def generate_castling_moves(self) -> Iterator[PseudoMove]:
         """Yields all possible castling moves for current side"""
-        for castling_right in self.side_castling_rights[self.next_side]:
+        for castling_right in SIDE_CASTLING_SYMBOLS[self.next_side]:
             squares_to_check = CASTLING_SQUARES_TO_CHECK[castling_right]
-            if not (
+            if self.castling_rights & CASTLING_BIT[castling_right] and not (
                 CASTLING_CLEAR_BITBOARD[castling_right] & self.move_boards["GAME"]
                 or any(map(self.square_attacked, squares_to_check))
             ):
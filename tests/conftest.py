@@ -1,5 +1,11 @@
 """Configuration file for unit testing via pytest"""
 
+import os
+
+# Renders GUI tests offscreen (no real window) unless a video driver is requested
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# pylint: disable=wrong-import-position
 import pytest
 
 from chess_ai.mcts import MCTS
@@ -1,10 +1,22 @@
 """Contains all unit tests for management of chess board state"""
 
+import numpy as np
 import pytest
 
-from chess_logic.board import STARTING_FEN
-from chess_logic.core_chess import Move
-from tests import RANDOM_FENS
+from chess_logic.board import (
+    BLACK,
+    FEN_CASTLING_RIGHTS,
+    INDEX_BITBOARD,
+    INDEX_INVERSE_BITBOARD,
+    ROWS_AND_COLUMNS,
+    SQUARE_BITBOARD,
+    STARTING_FEN,
+    UNSIGN_MASK,
+    rotate_bitboard,
+    rotate_bitboards,
+)
+from chess_logic.core_chess import Chess, Move
+from tests import RANDOM_FENS, TEST_FENS
 
 RANDOM_MOVES = (
     Move((1, 4), (0, 5)),
@@ -44,3 +56,97 @@ def test_moving_pieces(chess, move, new_fen) -> None:
     """Tests basic piece movement where piece moves to empty square"""
     chess.move_piece(move)
     assert chess.fen == new_fen
+    assert chess.current_state == Chess(new_fen).current_state
+
+
+@pytest.mark.parametrize("chess", TEST_FENS, indirect=True)
+def test_capturing_pieces(chess) -> None:
+    """Tests folded capture updates match removing captured piece then moving"""
+    for move in chess.current_legal_moves:
+        if captured_piece := chess.get_piece_at_square(move.new_square):
+            piece = chess.get_piece_at_square(move.old_square)
+            expected = Chess(chess.fen)
+            expected.remove_bitboard_square(captured_piece, move.new_square)
+            expected.move_piece_bitboard_square(piece, *move[:2])
+            captured = Chess(chess.fen)
+            captured.capture_piece_bitboard_square(piece, captured_piece, *move[:2])
+            assert (captured.boards, captured.mailbox, captured.zobrist_key) == (
+                expected.boards,
+                expected.mailbox,
+                expected.zobrist_key,
+            )
+
+
+@pytest.mark.parametrize("chess", TEST_FENS, indirect=True)
+def test_occupied_squares(chess) -> None:
+    """Tests that occupied squares yielded match pieces found at each square"""
+    assert dict(chess.occupied_squares()) == {
+        square: piece
+        for square in ROWS_AND_COLUMNS
+        if (piece := chess.get_piece_at_square(square))
+    }
+
+
+@pytest.mark.parametrize("fen_castling", FEN_CASTLING_RIGHTS)
+def test_castling_rights_conversion(fen_castling) -> None:
+    """Tests castling rights of every combination are read from and written to FEN"""
+    test_fen = f"r3k2r/8/8/8/8/8/8/R3K2R w {fen_castling} - 0 1"
+    assert Chess(test_fen).fen == test_fen
+
+
+@pytest.mark.parametrize(
+    "move, fen_castling",
+    (
+        (Move((7, 4), (7, 5)), "kq"),
+        (Move((7, 7), (4, 7)), "Qkq"),
+        (Move((7, 0), (0, 0)), "Kk"),
+        (Move((7, 1), (7, 2)), "KQkq"),
+    ),
+)
+def test_castling_rights_lost(move, fen_castling) -> None:
+    """Tests king/rook moves and rook captures void only the relevant rights"""
+    chess = Chess("r3k2r/8/8/8/8/8/8/RN2K2R w KQkq - 0 1")
+    chess.move_piece(move)
+    assert chess.fen.split()[2] == fen_castling
+
+
+def test_index_bitboards() -> None:
+    """Tests bitboards indexed by packed square match those keyed by coordinates"""
+    for row, column in ROWS_AND_COLUMNS:
+        assert INDEX_BITBOARD[row * 8 + column] == SQUARE_BITBOARD[(row, column)]
+        assert INDEX_INVERSE_BITBOARD[row * 8 + column] == UNSIGN_MASK ^ (
+            SQUARE_BITBOARD[(row, column)]
+        )
+
+
+@pytest.mark.parametrize("chess", TEST_FENS, indirect=True)
+def test_rotating_bitboards(chess) -> None:
+    """Tests that rotating bitboards in batch matches rotating each individually"""
+    bitboards = chess.boards
+    assert rotate_bitboards(np.array(bitboards, dtype=np.uint64)).tolist() == [
+        rotate_bitboard(bitboard) for bitboard in bitboards
+    ]
+
+
+@pytest.mark.parametrize("chess", TEST_FENS, indirect=True)
+def test_numeric_repr(chess) -> None:
+    """Tests numeric representation holds bitboards from perspective of next side"""
+    numeric_repr = chess.numeric_repr
+    castling_rights = [chess.castling_rights >> i & 1 for i in range(4)]
+    if chess.next_side == BLACK:
+        # Undoes rotation (black pieces and rights fill both halves of inputs)
+        numeric_repr[:12] = map(rotate_bitboard, numeric_repr[:12])
+        assert numeric_repr == (
+            chess.boards[6:12] * 2
+            + [chess.en_passant_bitboard]
+            + castling_rights[2:] * 2
+        )
+    else:
+        assert numeric_repr == (
+            chess.boards[:12] + [chess.en_passant_bitboard] + castling_rights
+        )
+
+
+def test_no_instance_dict(chess) -> None:
+    """Tests all chess state attributes are declared slots (no per-instance dict)"""
+    assert not hasattr(chess, "__dict__")
@@ -1,8 +1,12 @@
 """Contains all unit tests for move generation from chess board state"""
 
+from copy import deepcopy
+
 import pytest
 
+from chess_logic.board import BOARD_NAMES, ROWS_AND_COLUMNS, WHITE
 from chess_logic.core_chess import Chess
+from chess_logic.move_generation import Move
 from tests import TEST_FENS
 
 
@@ -10,12 +14,44 @@ from tests import TEST_FENS
 def test_board_orientation(test_fen) -> None:
     """Tests bitboard orientation for white and black in selected test positions"""
     test_chess = Chess(test_fen)
-    oriented_boards = test_chess.oriented_bitboards(test_chess.boards)
-    if test_chess.next_side == "WHITE":
+    boards = dict(zip(BOARD_NAMES, test_chess.boards))
+    oriented_boards = test_chess.oriented_bitboards(boards)
+    if test_chess.next_side == WHITE:
         # Checks no changes made when orienting bitboards for white
-        assert oriented_boards == test_chess.boards
+        assert oriented_boards == boards
     else:
         # Checks changes made when orienting bitboards for black and
         # orienting the bitboards twice gives the original bitboards
-        assert oriented_boards != test_chess.boards
-        assert test_chess.oriented_bitboards(oriented_boards) == test_chess.boards
+        assert oriented_boards != boards
+        assert test_chess.oriented_bitboards(oriented_boards) == boards
+
+
+@pytest.mark.parametrize("test_fen", TEST_FENS)
+def test_legal_moves_from_square(test_fen) -> None:
+    """Tests legal moves grouped by square match legal moves filtered by square"""
+    test_chess = Chess(test_fen)
+    for square in ROWS_AND_COLUMNS:
+        assert test_chess.legal_moves_from_square(square) == [
+            move for move in test_chess.current_legal_moves if move.old_square == square
+        ]
+
+
+@pytest.mark.parametrize("test_fen", TEST_FENS)
+def test_lazy_legal_moves(test_fen) -> None:
+    """Tests legal moves generated on demand (including after copying) are complete"""
+    test_chess = Chess(test_fen)
+    copied_chess = deepcopy(test_chess)
+    assert test_chess.current_legal_moves == test_chess.legal_moves()
+    assert copied_chess.current_legal_moves == test_chess.current_legal_moves
+
+
+def test_twofold_repetition() -> None:
+    """Tests knights moving out and back from starting position is drawn"""
+    test_chess = Chess()
+    knight_moves = (((7, 6), (5, 5)), ((0, 6), (2, 5)))
+    for old_square, new_square in knight_moves + tuple(
+        (new_square, old_square) for old_square, new_square in knight_moves
+    ):
+        assert not test_chess.game_over
+        test_chess.move_piece(Move(old_square, new_square))
+    assert test_chess.game_over_message == "Draw by twofold repetition"
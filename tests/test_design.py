@@ -1,18 +1,23 @@
 """Contains all unit tests for GUI"""
 
+import numpy as np
+import pygame
+
 from chess_logic.board import ROWS_AND_COLUMNS
 
 
 def test_square_fill(design) -> None:
     """Test if squares fill allocated space and handle borders correctly"""
-    # Loops through beginnings of squares horizontally and vertically
-    for square_coords in ROWS_AND_COLUMNS:
-        # Checks all pixels in square have same colour as first pixel
-        square_colour = design.get_at(design.square_to_pixel(square_coords))
-        assert all(
-            design.get_at(coord) == square_colour
-            for coord in design.get_square_range(square_coords)
-        )
+    design.draw_board_squares()
+    size = design.square_size
+    # Splits board pixels into blocks indexed by (column, x, row, y)
+    squares = pygame.surfarray.pixels2d(design)[: 8 * size, : 8 * size].reshape(
+        8, size, 8, size
+    )
+    # Finds squares with any pixel different to first pixel of the square
+    non_uniform = np.argwhere((squares != squares[:, :1, :, :1]).any(axis=(1, 3)))
+    del squares  # Unlocks design surface
+    assert not [(row, column) for column, row in non_uniform]
 
 
 def test_square_colours(design) -> None:
@@ -35,8 +40,47 @@ def test_square_colours(design) -> None:
         ),
     }
 
-    # Checks all test squares match expected colour
-    for expected_colour, test_squares in expected_colours_for_squares.items():
-        for test_square in test_squares:
-            actual_colour = design.get_at(design.square_to_pixel(test_square))[:-1]
-            assert expected_colour == actual_colour
+    # Gathers pixel coordinates and expected colours of test squares into arrays
+    test_pixels = np.array(
+        [
+            design.square_to_pixel(test_square)
+            for test_squares in expected_colours_for_squares.values()
+            for test_square in test_squares
+        ]
+    )
+    expected_colours = np.repeat(
+        list(expected_colours_for_squares),
+        list(map(len, expected_colours_for_squares.values())),
+        axis=0,
+    )
+
+    # Checks all test squares match expected colour in one comparison
+    actual_colours = pygame.surfarray.array3d(design)[
+        test_pixels[:, 0], test_pixels[:, 1]
+    ]
+    np.testing.assert_array_equal(actual_colours, expected_colours)
+
+
+def test_square_lookup_tables(design) -> None:
+    """Tests precomputed square pixels and rects match directly calculated ones"""
+    for square_coords in ROWS_AND_COLUMNS + ((1, 9), (1, 12)):
+        assert design.square_to_pixel(square_coords) == design.calculate_square_pixel(
+            square_coords
+        )
+        assert design.get_square_rect(square_coords) == design.calculate_square_rect(
+            square_coords
+        )
+
+
+def test_square_range(design) -> None:
+    """Tests square ranges index exactly the pixels of their squares"""
+    design.draw_board_squares()
+    pixels = pygame.surfarray.pixels2d(design)
+    for square_coords in ROWS_AND_COLUMNS:
+        square_range = design.get_square_range(square_coords)
+        assert len(square_range) == design.square_size**2
+        assert np.all(
+            pixels[square_range[:, 0], square_range[:, 1]]
+            == design.map_rgb(design.get_square_colour(square_coords))
+        )
+    del pixels  # Unlocks design surface
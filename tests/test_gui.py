@@ -1,9 +1,9 @@
 """Contains all unit tests for GUI"""
 
-from collections import Counter
 from itertools import chain, cycle, product
-from typing import Iterable
+from typing import Iterable, Optional
 
+import numpy as np
 import pygame
 import pygame_widgets
 import pytest
@@ -12,89 +12,110 @@ from chess_gui.gui import MOVE_COLOUR, ChessGUI
 from chess_logic.board import PIECE_SIDE, ROWS_AND_COLUMNS, Coord
 from tests import TEST_FENS
 
-TupleColour = tuple[int, int, int, int]
 TEST_DISPLAY_SIZES = list(product(range(500, 1500, 200), repeat=2))
 
 
 @pytest.mark.parametrize(
-    "gui",
+    "gui, test_fens",
     chain(
-        zip(cycle(TEST_DISPLAY_SIZES[:1]), TEST_FENS),
-        zip(TEST_DISPLAY_SIZES, cycle(TEST_FENS[:1])),
+        [((TEST_DISPLAY_SIZES[0],), TEST_FENS)],
+        zip(zip(TEST_DISPLAY_SIZES), cycle([TEST_FENS[:1]])),
     ),
-    indirect=True,
+    indirect=["gui"],
 )
-def test_piece_image_positioning_and_colours(gui: ChessGUI) -> None:
+def test_piece_image_positioning_and_colours(
+    gui: ChessGUI, test_fens: Iterable[str]
+) -> None:
     """Tests that all pieces are centred and have the correct colour"""
-    # Loops through squares, performing the tests if there is a piece there
-    for square_coords in ROWS_AND_COLUMNS:
-        if piece := gui.chess.get_piece_at_square(square_coords):
-            # Stores the mapped colour values for pixels in the square
-            square_pxs: list[TupleColour] = [
-                tuple(gui.design.get_at(coord))  # type: ignore[misc]
-                for coord in gui.design.get_square_range(square_coords)
-            ]
-            # Tests centring and colour of piece image in square
-            check_piece_image_centred(gui, square_pxs, square_coords)
-            check_piece_image_colours(square_pxs, piece)
+    # Reuses same GUI for all FENs instead of creating a GUI for each FEN
+    for test_fen in test_fens:
+        gui.load_fen(test_fen)
+        check_piece_images(gui)
+
+
+def check_piece_images(gui: ChessGUI) -> None:
+    """Checks that all pieces in GUI are centred and have the correct colour"""
+    pixels = pygame.surfarray.pixels2d(gui.design)
+    square_size = gui.design.square_size
+    # Maps colours of all squares to pixel values once rather than for every piece
+    mapped_square_colours = {
+        square: gui.design.map_rgb(colour)
+        for square, colour in gui.design.square_colours.items()
+    }
+    # Loops through occupied squares only, performing the tests for each piece
+    for square_coords, piece in gui.chess.occupied_squares():
+        # Stores the mapped colour values for pixels in the square
+        x, y = gui.design.square_to_pixel(square_coords)
+        square_pxs = pixels[x : x + square_size, y : y + square_size]
+        # Tests centring and colour of piece image in square
+        check_piece_image_centred(gui, square_pxs, mapped_square_colours[square_coords])
+        check_piece_image_colours(gui, square_pxs, piece)
+    del pixels  # Unlocks design surface
 
 
 def check_piece_image_centred(
-    test_gui: ChessGUI, square_pxs: list[TupleColour], squares: Coord
+    test_gui: ChessGUI, square_pxs: np.ndarray, square_colour: int
 ) -> None:
     """Tests whether each piece is centred horizontally and vertically within its
     square"""
-    # Filters coordinates of pixels different to square colours
-    square_colour = test_gui.design.get_square_colour(squares)
-    ranges_inside_image = [
-        coord
-        for coord, px_colour in zip(
-            test_gui.design.get_square_range(squares), square_pxs
-        )
-        if px_colour != square_colour
-    ]
-    # Loops through x and y coordinates separately for square and filtered pixels
-    for square_coord, image_range, square_size in zip(
-        test_gui.design.square_to_pixel(squares),
-        zip(*ranges_inside_image),
-        [test_gui.design.square_size] * 2,
-    ):
+    # Finds coordinates (relative to square) of pixels different to square colour,
+    # looping through x and y coordinates separately for filtered pixels
+    for image_range in np.nonzero(square_pxs != square_colour):
         # Checks paddings either side differ by at most 1 (allows odd padding size)
         assert (
-            abs(min(image_range) + max(image_range) - 2 * square_coord - square_size)
+            abs(image_range.min() + image_range.max() - test_gui.design.square_size)
             <= 1
         )
 
 
-def check_piece_image_colours(square_pxs: list[TupleColour], piece: str) -> None:
+def check_piece_image_colours(
+    test_gui: ChessGUI, square_pxs: np.ndarray, piece: str
+) -> None:
     """
     Tests whether squares contain the correct colour piece image by checking that
     piece colour is second most common (first is background) colour in image
     """
-    image_colour = Counter(square_pxs).most_common(2)[1][0]
+    colours, counts = np.unique(square_pxs, return_counts=True)
+    # Partially sorts counts, only placing second most common colour correctly
+    image_colour = test_gui.design.unmap_rgb(colours[np.argpartition(-counts, 1)[1]])
     assert image_colour == pytest.approx(pygame.Color(PIECE_SIDE[piece]), abs=7)
 
 
 def simulate_button_click(test_gui: ChessGUI, square_coords: Coord) -> None:
     """Simulates a button press at the given coordinates"""
-    test_coords = test_gui.design.get_square_rect(square_coords).center
+    # pylint: disable=protected-access
+    test_coords = test_gui.scale_coords(
+        test_gui.design.get_square_rect(square_coords).center
+    )
     pygame.event.set_grab(True)
-    test_gui.mainloop(100)
-    pygame.mouse.set_pos(*test_gui.scale_coords(test_coords))
+    test_gui.mainloop_once()
+    pygame.mouse.set_pos(*test_coords)
     pygame.event.set_grab(False)
-    test_gui.mainloop(100)
-    # pylint: disable=protected-access
-    pygame_widgets.mouse.Mouse._mouseState = pygame_widgets.mouse.MouseState.RELEASE
-    for widget in pygame_widgets.widget.WidgetHandler.getWidgets():
-        widget.clicked = True
-        widget.listen([])
-
-
-def find_move_buttons(test_gui: ChessGUI) -> Iterable[Coord]:
-    """Generator yielding all square coordinates shown as possible moves"""
-    for square_coords in ROWS_AND_COLUMNS:
+    if square_coords in ROWS_AND_COLUMNS:
+        # Releases mouse over square (board squares are hit-tested by GUI event loop)
+        pygame.event.post(
+            pygame.event.Event(
+                pygame.MOUSEBUTTONUP, pos=test_coords, button=pygame.BUTTON_LEFT
+            )
+        )
+        test_gui.mainloop_once()
+    else:
+        # Only off-board squares have buttons, so widgets only need to listen here
+        pygame_widgets.mouse.Mouse._mouseState = pygame_widgets.mouse.MouseState.RELEASE
+        for widget in pygame_widgets.widget.WidgetHandler.getWidgets():
+            widget.clicked = True
+            widget.listen([])
+
+
+def find_move_buttons(
+    test_gui: ChessGUI, squares: Optional[Iterable[Coord]] = None
+) -> Iterable[Coord]:
+    """Generator yielding square coordinates (of those given) shown as possible moves"""
+    # Defaults to squares GUI drew moves on rather than scanning whole board
+    for square_coords in test_gui.controls.move_squares if squares is None else squares:
+        # Samples square centre on display (design coordinates scaled to display)
         if test_gui.display.get_at(
-            test_gui.design.get_square_rect(square_coords).center
+            test_gui.scale_coords(test_gui.design.get_square_rect(square_coords).center)
         ) == pytest.approx(pygame.Color(MOVE_COLOUR), abs=2):
             yield square_coords
 
@@ -109,9 +130,32 @@ def test_showing_moves(gui: ChessGUI) -> None:
     simulate_button_click(gui, test_square_coords)
     assert any(find_move_buttons(gui))
 
-    # Tests clicking same piece twice clears moves
+    # Tests clicking same piece twice clears moves (scans every square, as GUI
+    # forgets drawn move squares when redrawing)
     simulate_button_click(gui, test_square_coords)
-    assert not any(find_move_buttons(gui))
+    assert not any(find_move_buttons(gui, ROWS_AND_COLUMNS))
+
+
+@pytest.mark.parametrize("gui", zip(TEST_DISPLAY_SIZES), indirect=True)
+def test_scaling_widgets(gui: ChessGUI) -> None:
+    """Tests that scaling all widgets at once matches scaling each individually"""
+    # pylint: disable=protected-access
+    widgets = pygame_widgets.WidgetHandler.getWidgets()
+    initial = [(w._x, w._y, w._width, w._height) for w in widgets]
+    expected = [gui.scale_coords(dimensions, (1000, 700)) for dimensions in initial]
+    gui.scale_widgets(widgets, (1000, 700))
+    assert [[w._x, w._y, w._width, w._height] for w in widgets] == expected
+
+
+def test_button_options_applied(gui: ChessGUI) -> None:
+    """Tests reusing button key with different options gives button with new options"""
+    rect = pygame.Rect(0, 0, 50, 50)
+    get_button = gui.controls.get_button
+    first = get_button("TEST", rect, lambda: None, "WHITE", radius=5)
+    assert get_button("TEST", rect, lambda: None, "WHITE", radius=5) is first
+    second = get_button("TEST", rect, lambda: None, "WHITE", radius=10)
+    widgets = pygame_widgets.WidgetHandler.getWidgets()
+    assert second is not first and second in widgets and first not in widgets
 
 
 TEST_TEXTS = (